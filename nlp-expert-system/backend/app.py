@@ -1,10 +1,36 @@
 # backend/app.py
-from fastapi import FastAPI, Request
+import asyncio
+import functools
+import hashlib
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import orjson
+from fastapi import FastAPI, Request, Response
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel
-from rule_engine import full_pipeline
+from typing import List
+
+from rule_engine import full_pipeline, full_pipeline_batch
+from nlp_engine import get_nlp, get_en_words
 from fastapi.middleware.cors import CORSMiddleware
 
-app = FastAPI(title="NLP Expert System API")
+# orjson serializes responses several times faster than the stdlib encoder
+app = FastAPI(title="NLP Expert System API", default_response_class=ORJSONResponse)
+
+# Pipeline work is CPU-bound; run it off the event loop so concurrent
+# requests don't serialize behind one spaCy call.
+_executor = ThreadPoolExecutor(max_workers=os.cpu_count())
+
+@app.on_event("startup")
+def warm_model():
+    # spaCy loads lazily; warm it in the background so the first /process
+    # request doesn't pay the multi-second model load.
+    def _warm():
+        get_nlp()
+        get_en_words()
+    threading.Thread(target=_warm, daemon=True).start()
 
 # allow CORS from frontend
 app.add_middleware(
@@ -19,11 +45,15 @@ class ProcessRequest(BaseModel):
     sentence: str
     mode: str = "standard"   # standard | simple | formal | professional | academic
 
+class BatchRequest(BaseModel):
+    sentences: List[str]
+    mode: str = "standard"
+
 @app.get("/")
 def root():
     return {"message":"NLP Expert System Backend running. POST /process with JSON {sentence, mode}"}
 
-@app.post("/process")
+@app.post("/process", response_model=None)
 async def process(req: ProcessRequest):
     """
     Returns JSON:
@@ -31,20 +61,36 @@ async def process(req: ProcessRequest):
       original, corrected, improved, rules_fired: [{name,reason,before,after}, ...]
     }
     """
-    result = full_pipeline(req.sentence)
+    loop = asyncio.get_running_loop()
+    payload = await loop.run_in_executor(_executor, _cached_pipeline, req.sentence, req.mode)
+    return Response(
+        content=payload,
+        media_type="application/json",
+        headers={"ETag": hashlib.md5(payload).hexdigest()},
+    )
+
+@functools.lru_cache(maxsize=4096)
+def _cached_pipeline(sentence, mode):
+    """Serialized pipeline result for (sentence, mode); repeats skip all NLP work."""
+    result = apply_mode(full_pipeline(sentence), mode)
+    return orjson.dumps(result)
+
+@app.post("/process_batch", response_model=None)
+async def process_batch(req: BatchRequest):
+    """
+    Batch variant of /process: one request, many sentences.
+    spaCy parses the whole batch via nlp.pipe, amortizing model overhead.
+    Returns a list of per-sentence results in input order.
+    """
+    loop = asyncio.get_running_loop()
+    results = await loop.run_in_executor(_executor, full_pipeline_batch, req.sentences)
+    return [apply_mode(result, req.mode) for result in results]
+
+def apply_mode(result, mode):
     # Optionally apply rewrite modes. We'll do a light mode mapping.
-    if req.mode and req.mode != "standard":
-        # very simple mode handling with replacement heuristics
-        if req.mode == "simple":
-            # simplify improved -> shorter
-            res = result
-            res["improved"] = make_simple(res["improved"])
-        elif req.mode == "formal":
-            res = result
-            res["improved"] = make_formal(res["improved"])
-        elif req.mode == "professional":
-            res = result
-            res["improved"] = make_professional(res["improved"])
+    handler = MODE_HANDLERS.get(mode)
+    if handler:
+        result["improved"] = handler(result["improved"])
     return result
 
 @app.get("/rules")
@@ -63,10 +109,13 @@ def rules():
     }
 
 # Mode helpers
+import re
+
+_SIMPLE_RX = re.compile(r'\b(favorable|unfavorable|professional)\b', flags=re.I)
+
 def make_simple(text):
     # remove some adjectives / simplify
-    import re
-    text = re.sub(r'\b(favorable|unfavorable|professional)\b', '', text, flags=re.I)
+    text = _SIMPLE_RX.sub('', text)
     return ' '.join(text.split())
 
 def make_formal(text):
@@ -74,3 +123,14 @@ def make_formal(text):
 
 def make_professional(text):
     return text.replace("good", "satisfactory").replace("bad", "unsatisfactory")
+
+def make_academic(text):
+    return text.replace("show", "demonstrate").replace("use", "utilize")
+
+# mode -> rewrite helper; "standard" and unknown modes pass through untouched
+MODE_HANDLERS = {
+    "simple": make_simple,
+    "formal": make_formal,
+    "professional": make_professional,
+    "academic": make_academic,
+}
@@ -4,10 +4,16 @@ Advanced fuzzy matching and phonetic-based spelling correction.
 Uses multiple strategies for detecting and correcting misspellings.
 """
 
-from difflib import SequenceMatcher, get_close_matches
+from collections import defaultdict
+from itertools import chain
 from typing import List, Tuple, Dict
 import re
 
+import ahocorasick
+from rapidfuzz import process
+from rapidfuzz.distance import Levenshtein
+from symspellpy import SymSpell, Verbosity
+
 # Common typing mistakes and corrections
 COMMON_TYPOS = {
     "teh": "the",
@@ -32,7 +38,6 @@ COMMON_TYPOS = {
     "thier": "their",
     "reccommend": "recommend",
     "sucess": "success",
-    "wich": "which",
     "becuase": "because",
 }
 
@@ -62,6 +67,46 @@ CONTEXT_MISTAKES = {
     r'\bgr8\b': 'great',
 }
 
+# Single alternation patterns compiled once at import: quick_spell_check
+# scans the text once per table instead of once per key.
+_QUICK_TYPO_RE = re.compile(
+    r'\b(' + '|'.join(re.escape(typo) for typo in COMMON_TYPOS) + r')\b',
+    flags=re.I,
+)
+
+# Bare-word view of CONTEXT_MISTAKES for single-token lookups: against an
+# already-split word, the \b...\b patterns reduce to string equality.
+# Derived at import so the original dict stays the single source of truth;
+# every key is a \b-anchored literal, so stripping the anchors yields the
+# plain word.
+_CONTEXT_WORDS = {
+    pattern.removeprefix(r'\b').removesuffix(r'\b'): replacement
+    for pattern, replacement in CONTEXT_MISTAKES.items()
+}
+
+_QUICK_CONTEXT_RE = re.compile(
+    r'\b(' + '|'.join(re.escape(word) for word in _CONTEXT_WORDS) + r')\b'
+)
+
+# Branchless ASCII lowercasing: one bytes.translate over a 256-byte table
+# beats Unicode-aware str.lower for the short ASCII tokens that dominate
+# English input.
+_LOWER_TABLE = bytes.maketrans(
+    bytes(range(256)),
+    bytes(c | 0x20 if 0x41 <= c <= 0x5A else c for c in range(256)),
+)
+
+def _fast_lower(s: str) -> str:
+    """Lowercase via the ASCII translate table, falling back to str.lower."""
+    if s.isascii():
+        return s.encode("ascii").translate(_LOWER_TABLE).decode("ascii")
+    return s.lower()
+
+# Word tokenizer for correct_text: one pass yields each word with its span,
+# so punctuation/whitespace pass through via slicing instead of per-token
+# prefix/suffix regex matching.
+_WORD_RE = re.compile(r"\w+", re.UNICODE)
+
 
 class FuzzyCorrector:
     """Advanced spelling correction using multiple strategies."""
@@ -77,18 +122,36 @@ class FuzzyCorrector:
         self.typo_map = COMMON_TYPOS
         self.phonetic_map = PHONETIC_MISTAKES
         self.context_map = CONTEXT_MISTAKES
+        # SymSpell precomputes deletes so per-word lookup is near O(1)
+        # instead of a SequenceMatcher pass over the whole dictionary.
+        self._sym = SymSpell(max_dictionary_edit_distance=2, prefix_length=7)
+        for entry in self.dictionary:
+            self._sym.create_dictionary_entry(entry, 1)
+        # Length buckets: fuzzy scans only look at words within +/-2 chars
+        # of the query, skipping most of the lexicon up front.
+        self._by_len = defaultdict(list)
+        for entry in self.dictionary:
+            self._by_len[len(entry)].append(entry)
+
+    def _length_pool(self, word: str):
+        """Dictionary words within +/-2 characters of the query's length."""
+        word_len = len(word)
+        return chain.from_iterable(
+            self._by_len[n] for n in range(max(1, word_len - 2), word_len + 3)
+        )
     
-    def correction_priority(self, word: str, candidates: List[str]) -> str:
+    def correction_priority(self, word: str, candidates: List[str],
+                            threshold: float = 0.75) -> str:
         """
         Select best correction candidate based on multiple heuristics.
-        
+
         Heuristics (in order of priority):
         1. Exact match in dictionary
         2. Common typo map
         3. Length similarity
-        4. Edit distance + phonetic similarity
+        4. Edit distance + phonetic similarity (must clear threshold)
         """
-        word_lower = word.lower()
+        word_lower = _fast_lower(word)
         
         # 1. Direct typo lookup
         if word_lower in self.typo_map:
@@ -105,14 +168,16 @@ class FuzzyCorrector:
         if not length_candidates:
             length_candidates = candidates
         
-        # 4. Score remaining candidates
+        # 4. Score remaining candidates (bounded Levenshtein in C); the
+        # cutoff rejects weak matches instead of returning the least-bad one
         if length_candidates:
-            best = max(
-                length_candidates,
-                key=lambda c: SequenceMatcher(None, word_lower, c.lower()).ratio()
-            )
-            return best
-        
+            best = process.extractOne(
+                word_lower, length_candidates,
+                scorer=Levenshtein.normalized_similarity,
+                score_cutoff=threshold)
+            if best:
+                return best[0]
+
         return word
     
     def correct_word(self, word: str, threshold: float = 0.75) -> Tuple[str, bool]:
@@ -122,22 +187,23 @@ class FuzzyCorrector:
         Returns:
             (corrected_word, was_corrected)
         """
-        word_lower = word.lower()
+        word_lower = _fast_lower(word)
         
         # 1. Try direct typo map
         if word_lower in self.typo_map:
             return self.typo_map[word_lower], True
         
-        # 2. Try context-free replacements
-        for pattern, replacement in self.context_map.items():
-            if re.match(pattern, word_lower):
-                return replacement, True
-        
-        # 3. Try fuzzy matching
-        candidates = get_close_matches(word_lower, self.dictionary, n=3, cutoff=threshold)
+        # 2. Try context-free replacements (plain dict hit; the \b-wrapped
+        # regex walk is only needed for whole-document substitution)
+        if word_lower in _CONTEXT_WORDS:
+            return _CONTEXT_WORDS[word_lower], True
         
+        # 3. Try fuzzy matching (SymSpell delete-lookup, pre-ranked by distance)
+        suggestions = self._sym.lookup(word_lower, Verbosity.CLOSEST, max_edit_distance=2)
+        candidates = [s.term for s in suggestions[:3]]
+
         if candidates:
-            best = self.correction_priority(word, candidates)
+            best = self.correction_priority(word, candidates, threshold)
             if best.lower() != word_lower:
                 return best, True
         
@@ -154,32 +220,29 @@ class FuzzyCorrector:
         Returns:
             (corrected_text, list of corrections)
         """
-        words = text.split()
-        corrected_words = []
+        pieces = []
         corrections = []
-        
-        for word in words:
-            # Separate punctuation from word
-            match = re.match(r'^([^\w]*)(\w+)([^\w]*)$', word, re.UNICODE)
-            if not match:
-                corrected_words.append(word)
-                continue
-            
-            prefix, actual_word, suffix = match.groups()
-            corrected, was_corrected = self.correct_word(actual_word, threshold=confidence)
-            
-            if was_corrected and corrected.lower() != actual_word.lower():
-                corrected_words.append(prefix + corrected + suffix)
+        last_end = 0
+
+        for match in _WORD_RE.finditer(text):
+            word = match.group(0)
+            corrected, was_corrected = self.correct_word(word, threshold=confidence)
+
+            pieces.append(text[last_end:match.start()])
+            if was_corrected and corrected.lower() != word.lower():
+                pieces.append(corrected)
                 corrections.append({
-                    "original": actual_word,
+                    "original": word,
                     "corrected": corrected,
                     "type": "spelling",
-                    "confidence": 0.9 if actual_word.lower() in self.typo_map else 0.75
+                    "confidence": 0.9 if word.lower() in self.typo_map else 0.75
                 })
             else:
-                corrected_words.append(word)
-        
-        return ' '.join(corrected_words), corrections
+                pieces.append(word)
+            last_end = match.end()
+
+        pieces.append(text[last_end:])
+        return ''.join(pieces), corrections
     
     def suggest_corrections(self, word: str, max_suggestions: int = 5) -> List[Tuple[str, float]]:
         """
@@ -194,18 +257,15 @@ class FuzzyCorrector:
         if word_lower in self.typo_map:
             return [(self.typo_map[word_lower], 1.0)]
         
-        # Fuzzy matches
-        candidates = get_close_matches(word_lower, self.dictionary, n=max_suggestions, cutoff=0.6)
-        
-        # Score each candidate
-        scored = []
-        for candidate in candidates:
-            similarity = SequenceMatcher(None, word_lower, candidate.lower()).ratio()
-            scored.append((candidate, similarity))
-        
-        # Sort by score
-        scored.sort(key=lambda x: x[1], reverse=True)
-        return scored[:max_suggestions]
+        # Fuzzy matches: rapidfuzz does scoring, top-k selection, and the
+        # sort in C in one call; the score_cutoff lets the bounded
+        # Levenshtein bail out early on clearly dissimilar pairs
+        matches = process.extract(
+            word_lower, self._length_pool(word_lower),
+            scorer=Levenshtein.normalized_similarity,
+            limit=max_suggestions, score_cutoff=0.6,
+        )
+        return [(candidate, score) for candidate, score, _ in matches]
     
     def batch_correct(self, texts: List[str], confidence: float = 0.75) -> List[Dict]:
         """
@@ -232,6 +292,29 @@ class ContextualSpellChecker:
     Uses simple heuristics to identify homophone errors.
     """
     
+    # Context cue phrases per homophone group; list order is priority,
+    # mirroring the original if/elif chains.
+    HOMOPHONE_CUES = {
+        "to/too/two": [
+            ("go to", "to"), ("give to", "to"),
+            ("too many", "too"), ("too much", "too"),
+            ("two of", "two"), ("two years", "two"),
+        ],
+        "their/there/they're": [
+            ("their ", "their"),
+            ("there is", "there"), ("there are", "there"), ("there was", "there"),
+            ("they are", "they're"),
+        ],
+        "your/you're": [("you are", "you're")],
+        "its/it's": [("it is", "it's"), ("it has", "it's")],
+    }
+
+    # What to fall back to when no cue phrase fires
+    HOMOPHONE_DEFAULTS = {
+        "your/you're": "your",
+        "its/it's": "its",
+    }
+
     def __init__(self):
         self.homophone_groups = {
             "to/too/two": ["to", "too", "two"],
@@ -247,7 +330,14 @@ class ContextualSpellChecker:
             "break/brake": ["break", "brake"],
             "see/sea": ["see", "sea"],
         }
-    
+        # One Aho-Corasick automaton over every cue phrase: a single linear
+        # scan of the context replaces the per-phrase substring checks.
+        self._cue_automaton = ahocorasick.Automaton()
+        for group_name, cues in self.HOMOPHONE_CUES.items():
+            for cue, chosen in cues:
+                self._cue_automaton.add_word(cue, (group_name, cue))
+        self._cue_automaton.make_automaton()
+
     def check_homophone(self, word: str, context: str) -> str:
         """
         Check if a word should be replaced with a homophone based on context.
@@ -260,49 +350,31 @@ class ContextualSpellChecker:
             Corrected word or original word
         """
         word_lower = word.lower()
-        
+
         # Find which homophone group this word belongs to
         group = None
         for group_name, homophones in self.homophone_groups.items():
             if word_lower in homophones:
                 group = homophones
                 break
-        
+
         if not group or len(group) <= 1:
             return word
-        
+
         context_lower = context.lower()
-        
-        # Simple heuristic: check common word patterns
-        if word_lower in ["to", "too", "two"]:
-            if "go to" in context_lower or "give to" in context_lower:
-                return "to"
-            elif "too many" in context_lower or "too much" in context_lower:
-                return "too"
-            elif "two of" in context_lower or "two years" in context_lower:
-                return "two"
-        
-        elif word_lower in ["their", "there", "they're"]:
-            if "their " in context_lower:
-                return "their"
-            elif "there is" in context_lower or "there are" in context_lower or "there was" in context_lower:
-                return "there"
-            elif "they are" in context_lower:
-                return "they're"
-        
-        elif word_lower in ["your", "you're"]:
-            if "you are" in context_lower:
-                return "you're"
-            else:
-                return "your"
-        
-        elif word_lower in ["its", "it's"]:
-            if "it is" in context_lower or "it has" in context_lower:
-                return "it's"
-            else:
-                return "its"
-        
-        return word
+
+        # One linear pass marks every cue phrase present in the context
+        matched = set()
+        for _, (cue_group, cue) in self._cue_automaton.iter(context_lower):
+            if cue_group == group_name:
+                matched.add(cue)
+
+        # First cue in priority order wins, same as the old if/elif chains
+        for cue, chosen in self.HOMOPHONE_CUES.get(group_name, []):
+            if cue in matched:
+                return chosen
+
+        return self.HOMOPHONE_DEFAULTS.get(group_name, word)
 
 
 def quick_spell_check(text: str, common_words: set = None) -> Tuple[str, int]:
@@ -313,20 +385,21 @@ def quick_spell_check(text: str, common_words: set = None) -> Tuple[str, int]:
     Returns:
         (corrected_text, corrections_made)
     """
-    corrected = text
     count = 0
-    
-    for typo, correct in COMMON_TYPOS.items():
-        pattern = re.compile(r'\b' + re.escape(typo) + r'\b', flags=re.I)
-        matches = pattern.findall(corrected)
-        if matches:
-            count += len(matches)
-            corrected = pattern.sub(correct, corrected)
-    
+
+    def _fix_typo(match):
+        nonlocal count
+        count += 1
+        return COMMON_TYPOS[match.group(0).lower()]
+
+    corrected = _QUICK_TYPO_RE.sub(_fix_typo, text)
+
     # Also apply context mistakes
-    for pattern, replacement in CONTEXT_MISTAKES.items():
-        if re.search(pattern, corrected):
-            corrected = re.sub(pattern, replacement, corrected)
-            count += 1
-    
+    def _fix_context(match):
+        nonlocal count
+        count += 1
+        return _CONTEXT_WORDS[match.group(0)]
+
+    corrected = _QUICK_CONTEXT_RE.sub(_fix_context, corrected)
+
     return corrected, count
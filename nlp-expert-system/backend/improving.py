@@ -86,6 +86,50 @@ PASSIVE_TO_ACTIVE = {
 }
 
 
+def _compile_alternation(table: Dict[str, str]) -> re.Pattern:
+    """Compile one whole-word alternation over a table's keys.
+
+    A single pass over the text replaces the per-key finditer loop, taking
+    the scan from O(keys x text) to O(text).
+    """
+    return re.compile(
+        r'\b(' + '|'.join(re.escape(word) for word in table) + r')\b',
+        flags=re.I,
+    )
+
+
+# Compiled once at module load; each improve_* call scans the text exactly once.
+_CLARITY_RX = _compile_alternation(CLARITY_IMPROVEMENTS)
+_PROFESSIONAL_RX = _compile_alternation(PROFESSIONAL_SYNONYMS)
+_CASUAL_RX = _compile_alternation(CASUAL_SIMPLIFICATION)
+
+_REDUNDANT_PATTERNS = [
+    (re.compile(pattern_str, flags=re.I), replacement)
+    for pattern_str, replacement in [
+        (r'absolutely\s+essential', 'essential'),
+        (r'final\s+conclusion', 'conclusion'),
+        (r'past\s+history', 'history'),
+        (r'true\s+fact', 'fact'),
+        (r'completely\s+finished', 'finished'),
+        (r'exact\s+same', 'same'),
+        (r'very\s+unique', 'unique'),
+        (r'free\s+gift', 'gift'),
+        (r'false\s+pretense', 'pretense'),
+    ]
+]
+
+_WEAK_PATTERNS = [
+    (re.compile(pattern_str, flags=re.I), replacement)
+    for pattern_str, replacement in [
+        (r'there\s+is\s+a\s+(\w+)\s+that', r'The \1 that'),
+        (r'it\s+is\s+important\s+to\s+note\s+that', r'Note that'),
+        (r'in\s+my\s+opinion', r'I believe'),
+        (r'it\s+seems\s+that', r'Apparently'),
+        (r'it\s+appears\s+that', r'It appears'),
+    ]
+]
+
+
 class SentenceImprover:
     """Improves sentence clarity, style, and professionalism."""
     
@@ -94,119 +138,74 @@ class SentenceImprover:
         self.professional_map = PROFESSIONAL_SYNONYMS
         self.casual_map = CASUAL_SIMPLIFICATION
     
+    def _replace_via(self, text: str, mapping: Dict[str, str], pattern: re.Pattern,
+                     change_type: str, reason: str) -> Tuple[str, List[Dict]]:
+        """One-pass table replacement: sub() with a dict-lookup callback.
+
+        The callback records each change, so the whole method is a single
+        linear scan instead of per-match string rewrites.
+        """
+        changes = []
+
+        def _swap(match):
+            old_text = match.group(0)
+            replacement = mapping[old_text.lower()]
+            new_text = replacement.capitalize() if old_text[0].isupper() else replacement
+            changes.append({
+                "type": change_type,
+                "before": old_text,
+                "after": new_text,
+                "reason": reason
+            })
+            return new_text
+
+        return pattern.sub(_swap, text), changes
+
     def improve_clarity(self, text: str) -> Tuple[str, List[Dict]]:
         """Replace vague verbs with more precise ones."""
-        improved = text
-        changes = []
-        
-        for vague, precise in self.clarity_map.items():
-            pattern = re.compile(r'\b' + vague + r'\b', flags=re.I)
-            matches = pattern.finditer(text)
-            for match in matches:
-                old_text = match.group(0)
-                new_text = precise.capitalize() if old_text[0].isupper() else precise
-                improved = improved.replace(old_text, new_text, 1)
-                changes.append({
-                    "type": "clarity",
-                    "before": old_text,
-                    "after": new_text,
-                    "reason": "Replace vague verb with precise alternative"
-                })
-        
-        return improved, changes
-    
+        return self._replace_via(
+            text, self.clarity_map, _CLARITY_RX,
+            "clarity", "Replace vague verb with precise alternative")
+
     def improve_professionalism(self, text: str) -> Tuple[str, List[Dict]]:
         """Apply professional vocabulary substitutions."""
-        improved = text
-        changes = []
-        
-        for informal, formal in self.professional_map.items():
-            pattern = re.compile(r'\b' + re.escape(informal) + r'\b', flags=re.I)
-            matches = pattern.finditer(text)
-            for match in matches:
-                old_text = match.group(0)
-                new_text = formal.capitalize() if old_text[0].isupper() else formal
-                improved = improved.replace(old_text, new_text, 1)
-                changes.append({
-                    "type": "professionalism",
-                    "before": old_text,
-                    "after": new_text,
-                    "reason": "Replace informal with professional vocabulary"
-                })
-        
-        return improved, changes
-    
+        return self._replace_via(
+            text, self.professional_map, _PROFESSIONAL_RX,
+            "professionalism", "Replace informal with professional vocabulary")
+
     def simplify_for_casual(self, text: str) -> Tuple[str, List[Dict]]:
         """Simplify overly formal language for casual tone."""
-        improved = text
-        changes = []
-        
-        for formal, casual in self.casual_map.items():
-            pattern = re.compile(r'\b' + re.escape(formal) + r'\b', flags=re.I)
-            matches = pattern.finditer(text)
-            for match in matches:
-                old_text = match.group(0)
-                new_text = casual.capitalize() if old_text[0].isupper() else casual
-                improved = improved.replace(old_text, new_text, 1)
-                changes.append({
-                    "type": "simplification",
-                    "before": old_text,
-                    "after": new_text,
-                    "reason": "Simplify overly formal vocabulary"
-                })
-        
-        return improved, changes
+        return self._replace_via(
+            text, self.casual_map, _CASUAL_RX,
+            "simplification", "Simplify overly formal vocabulary")
     
     def reduce_redundancy(self, text: str) -> Tuple[str, List[Dict]]:
         """Remove redundant phrases and repetition."""
         changes = []
         improved = text
-        
-        # Common redundant phrases
-        redundant_phrases = [
-            (r'absolutely\s+essential', 'essential'),
-            (r'final\s+conclusion', 'conclusion'),
-            (r'past\s+history', 'history'),
-            (r'true\s+fact', 'fact'),
-            (r'completely\s+finished', 'finished'),
-            (r'exact\s+same', 'same'),
-            (r'very\s+unique', 'unique'),
-            (r'free\s+gift', 'gift'),
-            (r'false\s+pretense', 'pretense'),
-        ]
-        
-        for pattern_str, replacement in redundant_phrases:
-            pattern = re.compile(pattern_str, flags=re.I)
-            matches = pattern.finditer(improved)
-            for match in matches:
+
+        for pattern, replacement in _REDUNDANT_PATTERNS:
+            def _swap(match, replacement=replacement):
                 old_text = match.group(0)
                 new_text = replacement.capitalize() if old_text[0].isupper() else replacement
-                improved = pattern.sub(new_text, improved, count=1)
                 changes.append({
                     "type": "redundancy",
                     "before": old_text,
                     "after": new_text,
                     "reason": "Remove redundant phrase"
                 })
-        
+                return new_text
+
+            improved = pattern.sub(_swap, improved)
+
         return improved, changes
     
     def enhance_readability(self, text: str) -> Tuple[str, List[Dict]]:
         """Break up overly long phrases and improve sentence flow."""
         changes = []
         improved = text
-        
-        # Replace weak constructions
-        weak_patterns = [
-            (r'there\s+is\s+a\s+(\w+)\s+that', r'The \1 that'),
-            (r'it\s+is\s+important\s+to\s+note\s+that', r'Note that'),
-            (r'in\s+my\s+opinion', r'I believe'),
-            (r'it\s+seems\s+that', r'Apparently'),
-            (r'it\s+appears\s+that', r'It appears'),
-        ]
-        
-        for pattern_str, replacement in weak_patterns:
-            pattern = re.compile(pattern_str, flags=re.I)
+
+        for pattern, replacement in _WEAK_PATTERNS:
             if pattern.search(improved):
                 new_text = pattern.sub(replacement, improved)
                 if new_text != improved:
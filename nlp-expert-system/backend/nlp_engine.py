@@ -1,17 +1,62 @@
 # backend/nlp_engine.py
+import functools
+import os
+import pickle
+
 import spacy
-from difflib import get_close_matches
+from rapidfuzz.distance import Levenshtein
+from spacy.tokens import DocBin
+from symspellpy import SymSpell, Verbosity
 import re
 
-nlp = spacy.load("en_core_web_sm")
+from fuzzy_corrector import COMMON_TYPOS
+
+# Pipeline components we never read. Only ner is safe to drop here:
+# tagger/parser feed tag_/dep_ (detect_question_order), attribute_ruler
+# feeds pos_, and the lemmatizer feeds the lemma_ checks in rule_engine.
+EXCLUDED_PIPES = ["ner"]
+
+@functools.lru_cache(maxsize=None)
+def get_nlp():
+    """Load the spaCy model on first use, without the pipeline components we don't use.
+
+    Deferring the load keeps import (and FastAPI startup) fast; endpoints that
+    never touch spaCy don't pay for it at all.
+    """
+    return spacy.load("en_core_web_sm", exclude=EXCLUDED_PIPES)
 
-# small dictionary for spell-check fallback
-EN_WORDS = set()
-try:
-    # attempt to populate basic wordset from spaCy vocab
-    EN_WORDS = {w.text.lower() for w in nlp.vocab if w.is_lower and w.is_alpha and len(w.text) > 1}
-except Exception:
-    EN_WORDS = set()
+# Wordset survives process restarts so the vocab walk only ever runs once per machine
+_EN_WORDS_CACHE = os.path.expanduser("~/.cache/english_expert/en_words.pkl")
+
+@functools.lru_cache(maxsize=None)
+def get_en_words():
+    """Small dictionary for spell-check fallback, built lazily from the spaCy vocab.
+
+    The result is a frozenset, pickled to disk on first build; later boots
+    skip both the model's vocab walk and the set construction.
+    """
+    try:
+        with open(_EN_WORDS_CACHE, "rb") as f:
+            return pickle.load(f)
+    except Exception:
+        pass
+    try:
+        nlp = get_nlp()
+        # Filtering the raw StringStore with str builtins avoids the Lexeme
+        # attribute lookups of the old per-Lexeme comprehension.
+        words = frozenset(
+            s for s in nlp.vocab.strings
+            if len(s) > 1 and s.islower() and s.isalpha()
+        )
+    except Exception:
+        return frozenset()
+    try:
+        os.makedirs(os.path.dirname(_EN_WORDS_CACHE), exist_ok=True)
+        with open(_EN_WORDS_CACHE, "wb") as f:
+            pickle.dump(words, f)
+    except OSError:
+        pass
+    return words
 
 INFORMAL_MAP = {
     "gonna": "going to",
@@ -30,24 +75,77 @@ WORDY_REPLACEMENTS = {
 }
 
 def preprocess(text):
-    doc = nlp(text)
+    doc = get_nlp()(text)
     return doc
 
+def preprocess_batch(texts, batch_size=64):
+    """Yield a Doc per text via nlp.pipe, which is faster per doc than repeated nlp(text)"""
+    yield from get_nlp().pipe(texts, batch_size=batch_size)
+
+# Attributes the rule engine actually reads; anything else needn't be
+# stored. HEAD must come along with DEP: without it the dependency tree
+# deserializes flat and token.head checks (subject-verb agreement) break.
+_DOC_CACHE_ATTRS = ["POS", "TAG", "DEP", "HEAD", "LEMMA", "LOWER"]
+
+def pretokenize_to_disk(texts, path, batch_size=64):
+    """Parse a static corpus once and persist the Docs as a DocBin.
+
+    For offline/evaluation runs over the same texts, later passes
+    deserialize instead of re-running the spaCy pipeline.
+    """
+    db = DocBin(attrs=_DOC_CACHE_ATTRS)
+    for doc in preprocess_batch(texts, batch_size=batch_size):
+        db.add(doc)
+    db.to_disk(path)
+
+def load_pretokenized(path):
+    """Yield Docs persisted by pretokenize_to_disk, in stored order."""
+    yield from DocBin().from_disk(path).get_docs(get_nlp().vocab)
+
+@functools.lru_cache(maxsize=None)
+def get_symspell():
+    """SymSpell index over the English wordset, built once on first use.
+
+    Precomputed deletes make per-word lookup near O(1) where difflib's
+    get_close_matches scanned the whole wordset per misspelling.
+    """
+    sym = SymSpell(max_dictionary_edit_distance=2, prefix_length=7)
+    for word in get_en_words():
+        sym.create_dictionary_entry(word, 1)
+    return sym
+
+# SymSpell bounds absolute edit distance only; for short tokens two edits
+# can be most of the word, so suggestions must also clear the relative
+# similarity cutoff the difflib-based matcher used.
+_FUZZY_CUTOFF = 0.78
+
+@functools.lru_cache(maxsize=50_000)
 def fuzzy_spell(word):
-    """Return best match from EN_WORDS using difflib"""
-    if word.lower() in EN_WORDS:
+    """Return best match from the English wordset using SymSpell.
+
+    Cached because the same misspellings recur across requests; repeat
+    lookups become a dict hit.
+    """
+    word_lower = word.lower()
+    # known typo table is the cheapest win, check it first
+    if word_lower in COMMON_TYPOS:
+        return COMMON_TYPOS[word_lower], True
+    if word_lower in get_en_words():
         return word, False
-    matches = get_close_matches(word.lower(), EN_WORDS, n=1, cutoff=0.78)
-    if matches:
-        return matches[0], True
+    suggestions = get_symspell().lookup(word_lower, Verbosity.CLOSEST, max_edit_distance=2)
+    if suggestions:
+        best = suggestions[0].term
+        if Levenshtein.normalized_similarity(word_lower, best) >= _FUZZY_CUTOFF:
+            return best, True
     # else return original
     return word, False
 
 def simple_token_spellcheck(doc):
     """Return list of (token, suggestion, changed_flag)"""
     results = []
+    en_words = get_en_words()
     for token in doc:
-        if token.is_alpha and token.lower_ not in EN_WORDS:
+        if token.is_alpha and token.lower_ not in en_words:
             suggestion, changed = fuzzy_spell(token.text)
             results.append((token.text, suggestion, changed))
     return results
@@ -1,190 +1,417 @@
 # backend/rule_engine.py
-from nlp_engine import preprocess, INFORMAL_MAP, WORDY_REPLACEMENTS, simple_token_spellcheck
+from nlp_engine import preprocess, preprocess_batch, INFORMAL_MAP, WORDY_REPLACEMENTS, simple_token_spellcheck
+import functools
 import re
+from dataclasses import dataclass
+
+import ahocorasick
+from spacy.attrs import LOWER
+
+# The third-party regex module optimizes large literal alternations into
+# an internal trie, scanning noticeably faster than stdlib re. Optional:
+# the patterns below are plain literals, so both engines match identically.
+try:
+    import regex as _re_impl
+except ImportError:
+    _re_impl = re
 
 # Simplified rule engine that applies forward-chaining rules.
 # Each rule returns a dict with: name, reason, before, after
 
-PRONOUNS_3SG = {"he", "she", "it", "this", "that", "someone", "anyone"}
+PRONOUNS_3SG = frozenset({"he", "she", "it", "this", "that", "someone", "anyone"})
+
+@dataclass
+class RuleCtx:
+    """Cached views over one parsed Doc, shared by the doc-phase rules.
+
+    doc.text rebuilds the string and token walks re-read attributes on
+    every access; computing them once here means each rule reads the
+    same cached values instead of re-walking the Doc.
+    """
+    doc: object
+    text: str
+    verbs: tuple
+
+    @classmethod
+    def from_doc(cls, doc):
+        return cls(
+            doc=doc,
+            text=doc.text,
+            verbs=tuple(t for t in doc if t.pos_ == "VERB"),
+        )
+
+TIME_MARKERS = frozenset({"yesterday", "ago", "last"})
+
+_time_marker_ids = None
+
+def _get_time_marker_ids(vocab):
+    """Hash IDs of the time markers, resolved once against the live vocab."""
+    global _time_marker_ids
+    if _time_marker_ids is None:
+        _time_marker_ids = frozenset(vocab.strings[w] for w in TIME_MARKERS)
+    return _time_marker_ids
+
+# small set of improvements: replace some words with synonyms for professional tone
+HEURISTIC_REWRITES = {
+    "go to": "visit",
+    "went to": "visited",
+    "buy": "purchase",
+    "get": "obtain",
+    "good": "favorable",
+    "bad": "unfavorable",
+}
+
+# One alternation pattern per table, compiled at import: each apply_* pass
+# scans the text once and dispatches replacements through a dict lookup,
+# instead of one full regex pass per table entry. Patterns are compiled
+# case-sensitive and matched against a lowercased shadow of the input;
+# spans index back into the original, avoiding re.I's case-folding cost.
+_INFORMAL_LC = {k.lower(): v for k, v in INFORMAL_MAP.items()}
+
+# Tier the informal keys by the cheapest mechanism that handles them.
+# Short keys that commonly sit inside longer words ("im" in "time",
+# "wanna" in "wannabe") go through the \b alternation; the rest use
+# plain C-level str.find, with the word boundaries re-checked by hand
+# around each hit so "gonnabe" and friends stay untouched.
+_INFORMAL_BOUNDARY_KEYS = frozenset({"im", "wanna"})
+_INFORMAL_LITERAL = {
+    k: v for k, v in _INFORMAL_LC.items() if k not in _INFORMAL_BOUNDARY_KEYS}
+
+def _compile_literal_alt(keys):
+    """Whole-word alternation over literal keys, longest key first.
+
+    Longest-first ordering makes stdlib re pick the longest of any
+    overlapping keys at a position (e.g. "went to" over "went"), the
+    same resolution the regex module's literal trie produces.
+    """
+    ordered = sorted(keys, key=len, reverse=True)
+    return _re_impl.compile(
+        r'\b(' + '|'.join(re.escape(k) for k in ordered) + r')\b')
+
+_INFORMAL_ALT = _compile_literal_alt(
+    k for k in _INFORMAL_LC if k in _INFORMAL_BOUNDARY_KEYS)
+
+# multiword phrases go through an Aho-Corasick automaton: one DFA pass over
+# the text finds every phrase at once, however large the table grows
+_WORDY_AC = ahocorasick.Automaton()
+for _k, _v in WORDY_REPLACEMENTS.items():
+    _WORDY_AC.add_word(_k.lower(), (_k.lower(), _v))
+_WORDY_AC.make_automaton()
+del _k, _v
+
+_HEURISTIC_ALT = _compile_literal_alt(HEURISTIC_REWRITES)
+_HEURISTIC_LC = {k.lower(): v for k, v in HEURISTIC_REWRITES.items()}
+
+# naive pattern: (where|when|what|why|how) <aux> <...>  (only in middle of sentence)
+# single word-set alternations behind shared \b anchors -- far fewer
+# backtrack points than the old per-word \b...\b alternatives
+_QUESTION_ORDER_RX = re.compile(
+    r'\b(?P<wh>where|when|what|why|how)\b\s+\b(?P<aux>is|are|was|were)\b\s+(?P<rest>[^?.!,]+)',
+    flags=re.I)
+
+_INFORMAL_KEYS = tuple(_INFORMAL_LC)
+
+def _word_char(c):
+    """True for characters \\b treats as word characters."""
+    return c == '_' or c.isalnum()
+
+# Trigger sets: the first word of every table key. Intersecting the
+# input's word set against these (one C-level frozenset operation) lets
+# the pipeline skip a rule outright when nothing in the text could match.
+_WORD_RX = re.compile(r'\w+')
+_WORDY_TRIGGERS = frozenset(k.lower().split()[0] for k in WORDY_REPLACEMENTS)
+_HEURISTIC_TRIGGERS = frozenset(k.split()[0] for k in _HEURISTIC_LC)
+_QUESTION_TRIGGERS = frozenset({"where", "when", "what", "why", "how"})
 
 def apply_informal_replacements(text):
     before = text
-    changed = False
-    for k, v in INFORMAL_MAP.items():
-        pattern = re.compile(r'\b' + re.escape(k) + r'\b', flags=re.I)
-        if pattern.search(text):
-            text = pattern.sub(v, text)
-            changed = True
-    return {"name":"Informal -> Formal","reason":"Replace common informal contractions","before":before, "after":text} if changed else None
+    # cheap C-level substring prescreen; most inputs contain no key at all,
+    # so the regex engine never even starts
+    text_lc = text.lower()
+    if not any(k in text_lc for k in _INFORMAL_KEYS):
+        return None
+    # literal tier: str.find over the lowered shadow, no regex at all;
+    # a hit only counts when both neighbours are non-word characters,
+    # mirroring the \b anchors of the boundary tier
+    edits = []
+    text_len = len(text_lc)
+    for key, replacement in _INFORMAL_LITERAL.items():
+        start = text_lc.find(key)
+        while start != -1:
+            end = start + len(key)
+            if ((start == 0 or not _word_char(text_lc[start - 1]))
+                    and (end == text_len or not _word_char(text_lc[end]))):
+                edits.append((start, end, replacement))
+            start = text_lc.find(key, end)
+    # boundary tier: the few keys that need \b keep the alternation
+    edits.extend(
+        (m.start(1), m.end(1), _INFORMAL_LC[m.group(1)])
+        for m in _INFORMAL_ALT.finditer(text_lc)
+    )
+    if not edits:
+        return None
+    text = apply_span_edits(text, edits)
+    return {"name":"Informal -> Formal","reason":"Replace common informal contractions","before":before, "after":text}
 
 def apply_wordy_simplification(text):
     before = text
-    changed = False
-    for k,v in WORDY_REPLACEMENTS.items():
-        pattern = re.compile(re.escape(k), flags=re.I)
-        if pattern.search(text):
-            text = pattern.sub(v, text)
-            changed = True
-    return {"name":"Wordy phrase simplification","reason":"Shorten verbose phrases","before":before, "after":text} if changed else None
-
-def apply_spelling_corrections(doc):
-    checks = simple_token_spellcheck(doc)
+    text_lc = text.lower()
+    # one automaton pass over the lowered text; spans index into the original
+    matches = []
+    for end_idx, (key, replacement) in _WORDY_AC.iter(text_lc):
+        start = end_idx - len(key) + 1
+        matches.append((start, end_idx + 1, replacement))
+    if not matches:
+        return None
+    # keep the leftmost-longest non-overlapping matches
+    matches.sort(key=lambda m: (m[0], m[0] - m[1]))
+    picked = []
+    last_end = 0
+    for start, end, replacement in matches:
+        if start >= last_end:
+            picked.append((start, end, replacement))
+            last_end = end
+    text = apply_span_edits(before, picked)
+    return {"name":"Wordy phrase simplification","reason":"Shorten verbose phrases","before":before, "after":text}
+
+def apply_spelling_corrections(ctx):
+    checks = simple_token_spellcheck(ctx.doc)
     changes = []
-    corrected_text = doc.text
+    # collect every fix first, then substitute all of them in one pass
+    sub_map = {}
     for orig, suggestion, changed in checks:
         if changed and suggestion.lower() != orig.lower():
-            # replace only whole-word matches (case-insensitive)
-            corrected_text = re.sub(r'\b' + re.escape(orig) + r'\b', suggestion, corrected_text, flags=re.I)
+            sub_map[orig.lower()] = suggestion
             changes.append({"name":"Spelling correction", "reason":f"Fuzzy match for '{orig}'", "before":orig, "after":suggestion})
+    if not sub_map:
+        return ctx.text, changes
+    # one alternation over all misspellings, whole-word, case-insensitive
+    pat = re.compile(r'\b(' + '|'.join(re.escape(k) for k in sub_map) + r')\b', flags=re.I)
+    corrected_text = pat.sub(lambda m: sub_map[m.group(1).lower()], ctx.text)
     return corrected_text, changes
 
-def apply_subject_verb_agreement(doc):
+def apply_subject_verb_agreement(ctx):
     """
     Very naive: if subject is third-person singular pronoun and verb is base form, add 's' to verb.
     This is a simplified demonstration rule. Real handling requires morphological analysis.
     """
-    sent = doc
-    changed = False
-    text = sent.text
+    text = ctx.text
     details = []
-    for token in sent:
+    edits = []
+    seen = set()
+    for token in ctx.doc:
         if token.dep_ == "nsubj" and token.head.pos_ == "VERB":
             subj = token.text.lower()
             verb = token.head
             # simple pattern: pronoun in 3rd sing and verb lemma equals token (present)
-            if subj in PRONOUNS_3SG:
+            if subj in PRONOUNS_3SG and verb.idx not in seen:
                 # quick check: if verb text equals lemma (likely base) and does not end with 's'
                 if verb.text.lower() == verb.lemma_.lower() and not verb.text.lower().endswith("s"):
                     # naive conjugation: add 's' to verb (not handling irregulars)
                     new_verb = verb.text + "s"
-                    # replace in text
-                    text = replace_token_in_text(text, verb.text, new_verb)
-                    changed = True
+                    # edit exactly this token via its character span
+                    edits.append((verb.idx, verb.idx + len(verb.text), new_verb))
+                    seen.add(verb.idx)
                     details.append({"name":"Subject-Verb agreement","reason":f"Subject '{token.text}' needs 3rd person singular verb","before":verb.text,"after":new_verb})
+    if edits:
+        text = apply_span_edits(text, edits)
     return text, details
 
-def replace_token_in_text(text, old, new):
-    # replace whole word, preserve case (simple)
-    def repl(match):
-        orig = match.group(0)
-        if orig[0].isupper():
-            return new.capitalize()
-        return new
-    import re
-    return re.sub(r'\b' + re.escape(old) + r'\b', repl, text)
+def apply_span_edits(text, edits):
+    """Rebuild text in one pass from (start, end, replacement) edits.
 
-def apply_tense_consistency(doc):
+    Token spans come from Token.idx, so only the intended occurrence is
+    touched — no regex, no risk of hitting an unrelated word.
+    """
+    # common case: a single edit needs no sort and no parts list
+    if len(edits) == 1:
+        start, end, new = edits[0]
+        return text[:start] + new + text[end:]
+    parts = []
+    cur = 0
+    for start, end, new in sorted(edits):
+        parts.append(text[cur:start])
+        parts.append(new)
+        cur = end
+    parts.append(text[cur:])
+    return "".join(parts)
+
+def apply_tense_consistency(ctx):
     """
     Simple rule: if time marker found (yesterday/ago/last), make present simple verbs into past by adding 'ed'.
     This is demonstrative only — proper conjugation needs more resources.
     """
-    tokens = [t.text.lower() for t in doc]
-    time_markers = {"yesterday","ago","last"}
-    if not any(t in time_markers for t in tokens):
+    # guard on hash IDs: to_array fills a numpy array in C, so no Python
+    # string is touched unless a marker is actually present
+    lower_ids = ctx.doc.to_array([LOWER])
+    if _get_time_marker_ids(ctx.doc.vocab).isdisjoint(lower_ids.ravel().tolist()):
         return None, []
-    text = doc.text
+    text = ctx.text
     details = []
-    for token in doc:
-        if token.pos_ == "VERB":
-            before = token.text
-            # naive: if lemma == token (present), add 'ed' (very naive)
-            if token.text.lower() == token.lemma_.lower() and not token.text.lower().endswith("ed"):
-                after = token.text + "ed"
-                text = replace_token_in_text(text, before, after)
-                details.append({"name":"Past Tense conversion","reason":"Time marker present","before":before,"after":after})
+    edits = []
+    for token in ctx.verbs:
+        before = token.text
+        # naive: if lemma == token (present), add 'ed' (very naive)
+        if token.text.lower() == token.lemma_.lower() and not token.text.lower().endswith("ed"):
+            after = token.text + "ed"
+            edits.append((token.idx, token.idx + len(before), after))
+            details.append({"name":"Past Tense conversion","reason":"Time marker present","before":before,"after":after})
+    if edits:
+        text = apply_span_edits(text, edits)
     return text, details
 
-def restructure_question_order(doc):
+def restructure_question_order(text):
     """
     Simple fix for embedded questions: '... where is the market' -> '... where the market is'
     We'll look for wh-word followed by copula inversion in subordinate clause.
+    Pure regex — takes the raw string, no Doc needed.
     """
-    text = doc.text
     details = []
-    # naive pattern: (where|when|what|why|how) <aux> <...>  (only in middle of sentence)
-    pattern = re.compile(r'(\bwhere\b|\bwhen\b|\bwhat\b|\bwhy\b|\bhow\b)\s+(\bis\b|\bare\b|\bwas\b|\bwere\b)\s+([^?.!,]+)', flags=re.I)
     def repl(m):
-        wh = m.group(1)
-        aux = m.group(2)
-        rest = m.group(3).strip()
+        wh = m['wh']
+        aux = m['aux']
+        rest = m['rest'].strip()
         # produce "where the market is"
         new = f"{wh} {rest} {aux}"
         details.append({"name":"Question reordering","reason":"Indirect question inversion","before":m.group(0),"after":new})
         return new
-    new_text, count = pattern.subn(repl, text)
+    new_text, count = _QUESTION_ORDER_RX.subn(repl, text)
     return new_text, details
 
+_LOG_KEYS = ("name", "reason", "before", "after")
+
 def full_pipeline(text):
-    # track rule logs
+    original, corrected, improved, logs = _cached_full_pipeline(text)
+    # rebuild fresh dicts so callers can't mutate the cached entry
+    return {
+        "original": original,
+        "corrected": corrected,
+        "improved": improved,
+        "rules_fired": [dict(zip(_LOG_KEYS, log)) for log in logs],
+    }
+
+@functools.lru_cache(maxsize=4096)
+def _cached_full_pipeline(text):
+    """Frozen pipeline result per input text; repeat inputs skip all NLP work."""
+    result = _run_pipeline(text)
+    logs = tuple(
+        tuple(log.get(key) for key in _LOG_KEYS)
+        for log in result["rules_fired"]
+    )
+    return result["original"], result["corrected"], result["improved"], logs
+
+def full_pipeline_batch(texts):
+    """Run the full pipeline over many sentences, batching the parse.
+
+    The regex phase is pure string work, so it runs up front for every
+    sentence; the already-rewritten strings then go through nlp.pipe in
+    one shot, and each Doc feeds the doc phase directly with no further
+    preprocess call.
+    """
+    staged = [_regex_phase(text) for text in texts]
+    docs = preprocess_batch([stage_text for stage_text, _ in staged])
+    results = []
+    for text, (stage_text, logs), doc in zip(texts, staged, docs):
+        corrected, doc_logs = _doc_phase(stage_text, doc)
+        results.append(_assemble(text, corrected, logs + doc_logs))
+    return results
+
+def _run_pipeline(text, doc=None):
+    current_text, logs = _regex_phase(text)
+    if doc is not None and current_text != text:
+        doc = None  # the provided parse predates the regex rewrites
+    corrected, doc_logs = _doc_phase(current_text, doc)
+    return _assemble(text, corrected, logs + doc_logs)
+
+def _regex_phase(text):
+    """String-only rules; no Doc needed, so the spaCy parse waits."""
     logs = []
-    doc = preprocess(text)
     current_text = text
 
-    # 1. informal replacements
+    # Word fingerprint of the input, computed once. None of the informal
+    # replacements introduce a wordy or wh trigger word, so gating on the
+    # original text stays correct even after earlier rules rewrite it.
+    words = frozenset(_WORD_RX.findall(text.lower()))
+
+    # 1. informal replacements (has its own substring prescreen, which
+    # also covers non-word keys like "ain't" that findall would split)
     r = apply_informal_replacements(current_text)
     if r:
         logs.append(r)
         current_text = r["after"]
-        doc = preprocess(current_text)
 
     # 2. wordy simplifications
-    r = apply_wordy_simplification(current_text)
-    if r:
-        logs.append(r)
-        current_text = r["after"]
-        doc = preprocess(current_text)
+    if _WORDY_TRIGGERS & words:
+        r = apply_wordy_simplification(current_text)
+        if r:
+            logs.append(r)
+            current_text = r["after"]
 
-    # 3. spelling
-    new_text, changes = apply_spelling_corrections(doc)
+    # 3. restructure question order
+    if _QUESTION_TRIGGERS & words:
+        new_text, details = restructure_question_order(current_text)
+        if details:
+            logs.extend(details)
+            current_text = new_text
+
+    return current_text, logs
+
+def _doc_phase(text, doc=None):
+    """Doc-reading rules with a lazy parse: each rule asks for the ctx
+    right before it runs, and a mutation only marks the ctx stale. A rule
+    skipped by its string-level guard never forces the re-parse at all."""
+    logs = []
+    current_text = text
+
+    ctx = RuleCtx.from_doc(doc) if doc is not None else None
+
+    def _ensure_ctx():
+        nonlocal ctx
+        if ctx is None:
+            ctx = RuleCtx.from_doc(preprocess(current_text))
+        return ctx
+
+    # 4. spelling
+    new_text, changes = apply_spelling_corrections(_ensure_ctx())
     if changes:
         logs.extend(changes)
         current_text = new_text
-        doc = preprocess(current_text)
+        ctx = None  # parse predates the rewrite; re-parse only if needed
 
-    # 4. subject-verb agreement
-    new_text, details = apply_subject_verb_agreement(doc)
+    # 5. subject-verb agreement
+    new_text, details = apply_subject_verb_agreement(_ensure_ctx())
     if details:
         logs.extend(details)
         current_text = new_text
-        doc = preprocess(current_text)
+        ctx = None
 
-    # 5. tense consistency
-    new_text, details = apply_tense_consistency(doc)
-    if details:
-        logs.extend(details)
-        current_text = new_text
-        doc = preprocess(current_text)
+    # 6. tense consistency — cheap string check first, so a missing time
+    # marker skips the rule without ever re-parsing the corrected text
+    if not TIME_MARKERS.isdisjoint(_WORD_RX.findall(current_text.lower())):
+        new_text, details = apply_tense_consistency(_ensure_ctx())
+        if details:
+            logs.extend(details)
+            current_text = new_text
 
-    # 6. restructure question order
-    new_text, details = restructure_question_order(doc)
-    if details:
-        logs.extend(details)
-        current_text = new_text
-        doc = preprocess(current_text)
+    return current_text, logs
 
-    # "improved" rewrite passes (optional minor synonyms)
-    improved = heuristics_rewrite(current_text)
-
-    response = {
-        "original": text,
-        "corrected": current_text,
-        "improved": improved,
+def _assemble(original, corrected, logs):
+    return {
+        "original": original,
+        "corrected": corrected,
+        # "improved" rewrite passes (optional minor synonyms)
+        "improved": heuristics_rewrite(corrected),
         "rules_fired": logs
     }
-    return response
 
 def heuristics_rewrite(text):
-    # small set of improvements: replace some words with synonyms for professional tone
-    repl = {
-        "go to": "visit",
-        "went to": "visited",
-        "buy": "purchase",
-        "get": "obtain",
-        "good": "favorable",
-        "bad": "unfavorable",
-    }
-    import re
-    out = text
-    for k,v in repl.items():
-        out = re.sub(r'\b' + re.escape(k) + r'\b', v, out, flags=re.I)
-    return out
+    text_lc = text.lower()
+    if not _HEURISTIC_TRIGGERS.intersection(_WORD_RX.findall(text_lc)):
+        return text
+    edits = [
+        (m.start(1), m.end(1), _HEURISTIC_LC[m.group(1)])
+        for m in _HEURISTIC_ALT.finditer(text_lc)
+    ]
+    if not edits:
+        return text
+    return apply_span_edits(text, edits)